@@ -0,0 +1,47 @@
+"""Conditional-request support for the landing page."""
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from app.landing_page import RENDER_VERSION
+from app.landing_service import LandingPageService
+
+LANDING_PATH = "/"
+
+
+def landing_page_etag(content_etag: str) -> str:
+    """Weak ETag of the landing page: its published content plus the code, templates and styles that render it."""
+    return f'W/"{content_etag}-{RENDER_VERSION}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header (a comma-separated list of tags, or *) against an ETag, comparing weakly."""
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+class LandingPageETagMiddleware(BaseHTTPMiddleware):
+    """Tag the landing page with a fingerprint of its content.
+
+    Every GET renders a page bound to a fresh NiceGUI client id, so a cached copy cannot be reused and GET is
+    never answered with 304. HEAD requests (crawlers, monitors) are answered from the cached bundle without
+    rendering the page at all.
+    """
+
+    async def dispatch(self, request, call_next):
+        if request.url.path != LANDING_PATH or request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+
+        bundle = await run_in_threadpool(LandingPageService.get_page_bundle, "home")
+        if bundle is None:
+            return await call_next(request)
+
+        etag = landing_page_etag(bundle.etag)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.method == "HEAD":
+            not_modified = etag_matches(request.headers.get("if-none-match", ""), etag)
+            return Response(status_code=304 if not_modified else 200, headers=headers)
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
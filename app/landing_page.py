@@ -1,13 +1,222 @@
 """Modern landing page UI module."""
 
+import gzip
+import hashlib
 import logging
-from nicegui import ui
-from typing import List
-from app.landing_service import LandingPageService
-from app.models import LandingPage, HeroSection, Feature, CallToActionSection
+import re
+from pathlib import Path
+from fastapi import Header
+from fastapi.responses import Response
+from jinja2 import Environment, FileSystemLoader
+import nicegui
+from nicegui import app, ui
+from typing import Callable, Iterable, List, TypeVar
+from app.landing_service import LandingPageBundle, LandingPageService, build_cta_style, build_hero_style
+from app.models import HeroSection, Feature, CallToActionSection
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Self-hosted web fonts, served at /fonts (Inter 4.1, SIL Open Font License, see static/fonts/OFL.txt)
+FONTS_DIR = Path(__file__).parent / "static" / "fonts"
+
+# One file per weight the page uses; body text is set in the regular weight
+_INTER_FILES = {
+    400: "Inter-Regular.woff2",
+    500: "Inter-Medium.woff2",
+    600: "Inter-SemiBold.woff2",
+    700: "Inter-Bold.woff2",
+}
+_INTER_BODY_FILE = _INTER_FILES[400]
+
+_CUSTOM_CSS = """
+    /* Global styles */
+    body {
+        font-family: 'Inter', sans-serif;
+        line-height: 1.6;
+    }
+
+    /* Glass morphism effect */
+    .glass-card {
+        background: rgba(255, 255, 255, 0.1);
+        backdrop-filter: blur(20px);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    }
+
+    /* Gradient backgrounds */
+    .gradient-bg,
+    .gradient-text {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    }
+
+    .gradient-text {
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+    }
+
+    /* Smooth animations */
+    .fade-in {
+        animation: fadeIn 0.8s ease-in-out;
+        will-change: opacity;
+    }
+
+    .slide-up {
+        animation: slideUp 0.6s ease-out;
+    }
+
+    @keyframes fadeIn {
+        from { opacity: 0; }
+        to { opacity: 1; }
+    }
+
+    @keyframes slideUp {
+        from {
+            opacity: 0;
+            transform: translateY(30px);
+        }
+        to {
+            opacity: 1;
+            transform: translateY(0);
+        }
+    }
+
+    /* Shared transitions */
+    .feature-card,
+    .cta-button {
+        transition: all 0.3s ease;
+    }
+
+    /* Lifted elements get their own compositor layer so hover moves skip layout and paint */
+    .feature-card,
+    .hover-lift,
+    .cta-button {
+        will-change: transform;
+    }
+
+    /* Hover effects */
+    .hover-lift:hover {
+        transform: translateY(-8px);
+        box-shadow: 0 20px 40px rgba(0, 0, 0, 0.15);
+    }
+
+    /* Feature card styling */
+    .feature-card {
+        border-radius: 16px;
+    }
+
+    .feature-card:hover {
+        transform: translateY(-4px);
+        box-shadow: 0 12px 24px rgba(0, 0, 0, 0.1);
+    }
+
+    /* Button enhancements */
+    .cta-button {
+        background: linear-gradient(45deg, #3b82f6 0%, #8b5cf6 100%);
+        border: none;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }
+
+    .cta-button:hover {
+        background: linear-gradient(45deg, #2563eb 0%, #7c3aed 100%);
+        transform: translateY(-2px);
+        box-shadow: 0 8px 16px rgba(59, 130, 246, 0.3);
+    }
+
+    /* Skip layout and paint for off-screen content */
+    .lazy-render {
+        content-visibility: auto;
+        contain-intrinsic-size: auto 320px;
+    }
+
+    /* Section spacing */
+    .section-padding {
+        padding: 5rem 0;
+    }
+
+    /* Responsive design helpers */
+    @media (max-width: 768px) {
+        .section-padding {
+            padding: 3rem 0;
+        }
+    }
+"""
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace in a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).strip()
+
+
+def _font_face_css() -> str:
+    """Declare the bundled Inter weights."""
+    return "".join(
+        f"@font-face {{ font-family: 'Inter'; src: url('/fonts/{name}') format('woff2'); "
+        f"font-weight: {weight}; font-style: normal; font-display: swap; }}"
+        for weight, name in _INTER_FILES.items()
+    )
+
+
+# Stylesheet served as a separate, cacheable file; compressed once at import rather than per request
+_STYLES_CSS = _minify_css(_font_face_css() + _CUSTOM_CSS).encode()
+_STYLES_GZ = gzip.compress(_STYLES_CSS, compresslevel=9, mtime=0)
+_STYLES_VERSION = hashlib.blake2b(_STYLES_CSS, digest_size=6).hexdigest()
+
+# Versioned by content, so browsers may keep it for good
+STYLES_PATH = "/static/styles.css"
+STYLES_URL = f"{STYLES_PATH}?v={_STYLES_VERSION}"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+FONTS_MAX_CACHE_AGE = 31536000
+
+# Built once at import so each page mount only hands over a ready-made string; the body font is preloaded
+_CUSTOM_STYLES_HTML = (
+    f'<link rel="preload" href="/fonts/{_INTER_BODY_FILE}" as="font" type="font/woff2" crossorigin>'
+    f'<link rel="stylesheet" href="{STYLES_URL}">'
+)
+
+
+# Section markup, compiled once per process rather than on every render
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+_TEMPLATES = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_HERO_TPL = _TEMPLATES.get_template("hero.html.j2")
+_FEATURE_TPL = _TEMPLATES.get_template("feature_card.html.j2")
+_CTA_TPL = _TEMPLATES.get_template("cta.html.j2")
+
+# Fingerprint of everything besides page content that shapes the rendered page: this module, its templates, the
+# stylesheet and the NiceGUI release. Part of the page ETag, so a deploy that changes markup revalidates caches.
+RENDER_VERSION = hashlib.blake2b(
+    b"".join(
+        [
+            Path(__file__).read_bytes(),
+            *(template.read_bytes() for template in sorted(TEMPLATES_DIR.glob("*.j2"))),
+            _STYLES_CSS,
+            nicegui.__version__.encode(),
+        ]
+    ),
+    digest_size=6,
+).hexdigest()
+
+
+# Hero overlay style, it does not depend on page content
+_HERO_DECORATION_STYLE = (
+    "position: absolute; top: 0; left: 0; right: 0; bottom: 0; pointer-events: none; "
+    "background: radial-gradient(circle at 30% 20%, rgba(59, 130, 246, 0.3) 0%, transparent 50%), "
+    "radial-gradient(circle at 70% 80%, rgba(139, 92, 246, 0.3) 0%, transparent 50%);"
+)
+
 
 def apply_modern_theme():
     """Apply modern color theme for 2025."""
@@ -24,300 +233,95 @@ def apply_modern_theme():
 
 def add_custom_styles():
     """Add custom CSS styles for the landing page."""
-    ui.add_head_html("""
-    <style>
-        /* Import modern font */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-        
-        /* Global styles */
-        body {
-            font-family: 'Inter', sans-serif;
-            line-height: 1.6;
-        }
-        
-        /* Glass morphism effect */
-        .glass-card {
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        }
-        
-        /* Gradient backgrounds */
-        .gradient-bg {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }
-        
-        .gradient-text {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-        
-        /* Smooth animations */
-        .fade-in {
-            animation: fadeIn 0.8s ease-in-out;
-        }
-        
-        .slide-up {
-            animation: slideUp 0.6s ease-out;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
-        }
-        
-        @keyframes slideUp {
-            from { 
-                opacity: 0;
-                transform: translateY(30px);
-            }
-            to { 
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        /* Hover effects */
-        .hover-lift:hover {
-            transform: translateY(-8px);
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.15);
-        }
-        
-        /* Feature card styling */
-        .feature-card {
-            transition: all 0.3s ease;
-            border-radius: 16px;
-        }
-        
-        .feature-card:hover {
-            transform: translateY(-4px);
-            box-shadow: 0 12px 24px rgba(0, 0, 0, 0.1);
-        }
-        
-        /* Button enhancements */
-        .cta-button {
-            background: linear-gradient(45deg, #3b82f6 0%, #8b5cf6 100%);
-            border: none;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            transition: all 0.3s ease;
-        }
-        
-        .cta-button:hover {
-            background: linear-gradient(45deg, #2563eb 0%, #7c3aed 100%);
-            transform: translateY(-2px);
-            box-shadow: 0 8px 16px rgba(59, 130, 246, 0.3);
-        }
-        
-        /* Section spacing */
-        .section-padding {
-            padding: 5rem 0;
-        }
-        
-        /* Responsive design helpers */
-        @media (max-width: 768px) {
-            .section-padding {
-                padding: 3rem 0;
-            }
-        }
-    </style>
-    """)
-
-
-def create_hero_section(hero: HeroSection):
-    """Create a modern hero section."""
-    # Hero background styling
-    hero_bg_style = f"""
-        background: {hero.background_color or "linear-gradient(135deg, #1e293b 0%, #334155 100%)"};
-        color: {hero.text_color or "#ffffff"};
-        min-height: 100vh;
-        position: relative;
-        overflow: hidden;
-    """
-
-    if hero.background_image_url:
-        hero_bg_style += f"background-image: url('{hero.background_image_url}'); background-size: cover; background-position: center;"
-
-    with ui.element("section").style(hero_bg_style).classes("flex items-center justify-center relative"):
-        # Background decoration
-        ui.element("div").style("""
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: radial-gradient(circle at 30% 20%, rgba(59, 130, 246, 0.3) 0%, transparent 50%),
-                        radial-gradient(circle at 70% 80%, rgba(139, 92, 246, 0.3) 0%, transparent 50%);
-            pointer-events: none;
-        """)
-
-        # Hero content
-        with ui.column().classes("z-10 max-w-4xl mx-auto text-center px-6 fade-in"):
-            # Headline
-            ui.label(hero.headline).classes("text-5xl md:text-6xl font-bold mb-6 leading-tight")
-
-            # Subheadline
-            if hero.subheadline:
-                ui.label(hero.subheadline).classes("text-xl md:text-2xl font-light mb-8 opacity-90")
-
-            # Description
-            if hero.description:
-                ui.label(hero.description).classes("text-lg mb-12 max-w-2xl mx-auto opacity-80 leading-relaxed")
-
-            # Action buttons
-            if hero.primary_button_text or hero.secondary_button_text:
-                with ui.row().classes("gap-4 justify-center flex-wrap"):
-                    if hero.primary_button_text:
-                        primary_url = hero.primary_button_url or "#"
-
-                        def handle_primary_click(url=primary_url):
-                            if url != "#":
-                                ui.navigate.to(url)
-
-                        ui.button(hero.primary_button_text, on_click=handle_primary_click).classes(
-                            "cta-button px-8 py-4 text-lg rounded-xl shadow-lg"
-                        )
-
-                    if hero.secondary_button_text:
-                        secondary_url = hero.secondary_button_url or "#"
-
-                        def handle_secondary_click(url=secondary_url):
-                            if url != "#":
-                                ui.navigate.to(url)
-
-                        ui.button(hero.secondary_button_text, on_click=handle_secondary_click).classes(
-                            "px-8 py-4 text-lg rounded-xl border-2 border-white/30 bg-transparent hover:bg-white/10 transition-all"
-                        ).props("outline")
-
-
-def create_feature_card(feature: Feature, is_featured: bool = False):
-    """Create a modern feature card."""
-    card_classes = "feature-card p-8 bg-white shadow-lg hover-lift transition-all duration-300"
-    if is_featured:
-        card_classes += " ring-2 ring-blue-500/20"
-
-    with ui.card().classes(card_classes):
-        # Feature icon
-        if feature.icon:
-            with ui.row().classes("items-center mb-6"):
-                ui.icon(feature.icon, size="3rem").style(f"color: {feature.icon_color or '#3b82f6'}")
-                if is_featured:
-                    ui.badge("Featured").classes("ml-auto bg-gradient-to-r from-blue-500 to-purple-600 text-white")
-
-        # Feature content
-        ui.label(feature.title).classes("text-2xl font-bold mb-4 text-gray-800")
-        ui.label(feature.description).classes("text-gray-600 leading-relaxed mb-6")
-
-        # Feature link
-        if feature.link_text and feature.link_url:
-            ui.link(feature.link_text, feature.link_url, new_tab=True).classes(
-                "text-blue-600 hover:text-blue-800 font-semibold inline-flex items-center"
-            )
-
-
-def create_features_section(features: List[Feature]):
-    """Create the features section."""
-    if not features:
+    # Shared, so the stylesheet link is part of every page head rather than only the auto-index page
+    ui.add_head_html(_CUSTOM_STYLES_HTML, shared=True)
+
+
+def serve_styles(accept_encoding: str = Header(default="")) -> Response:
+    """Serve the landing page stylesheet, precompressed when the client accepts gzip."""
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if "gzip" in accept_encoding.lower():
+        return Response(_STYLES_GZ, media_type="text/css", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(_STYLES_CSS, media_type="text/css", headers=headers)
+
+
+def _hero_html(hero: HeroSection) -> str:
+    """Render a hero section as HTML."""
+    # Hero background styling is built when the section is saved
+    hero_bg_style = hero.computed_style or build_hero_style(hero)
+    return _HERO_TPL.render(hero=hero, style=hero_bg_style, decoration_style=_HERO_DECORATION_STYLE)
+
+
+def _feature_card_html(feature: Feature, is_featured: bool = False) -> str:
+    """Render a modern feature card as HTML."""
+    return _FEATURE_TPL.render(f=feature, featured=is_featured)
+
+
+def create_features_section(featured_features: List[Feature], other_features: List[Feature]):
+    """Create the features section as a single HTML element."""
+    if not featured_features and not other_features:
         return
 
-    with ui.element("section").classes("section-padding bg-gray-50"):
-        with ui.column().classes("max-w-7xl mx-auto px-6"):
-            # Section header
-            with ui.column().classes("text-center mb-16 slide-up"):
-                ui.label("Why Choose Our Platform?").classes("text-4xl font-bold text-gray-800 mb-4")
-                ui.label("Discover the features that make us different").classes(
-                    "text-xl text-gray-600 max-w-2xl mx-auto"
-                )
-
-            # Featured features (first 3)
-            featured_features = [f for f in features if f.is_featured][:3]
-            if featured_features:
-                with ui.row().classes("gap-8 mb-16 justify-center flex-wrap"):
-                    for feature in featured_features:
-                        with ui.column().classes("w-full md:w-80"):
-                            create_feature_card(feature, is_featured=True)
-
-            # Additional features grid
-            other_features = [f for f in features if not f.is_featured]
-            if other_features:
-                ui.label("More Features").classes("text-2xl font-bold text-center mb-8 text-gray-800")
-                with ui.grid(columns=3).classes("gap-6 w-full"):
-                    for feature in other_features:
-                        create_feature_card(feature)
-
-
-def create_cta_section(cta: CallToActionSection):
-    """Create a call-to-action section."""
-    # CTA styling
-    cta_bg_style = f"""
-        background: {cta.background_color or "linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%)"};
-        color: {cta.text_color or "#1f2937"};
-    """
-
-    if cta.background_image_url:
-        cta_bg_style += (
-            f"background-image: url('{cta.background_image_url}'); background-size: cover; background-position: center;"
+    parts = [
+        '<section class="section-padding bg-gray-50"><div class="max-w-7xl mx-auto px-6">',
+        # Section header
+        '<div class="text-center mb-16 slide-up">'
+        '<div class="text-4xl font-bold text-gray-800 mb-4">Why Choose Our Platform?</div>'
+        '<div class="text-xl text-gray-600 max-w-2xl mx-auto">Discover the features that make us different</div>'
+        "</div>",
+    ]
+
+    # Featured features (first 3)
+    if featured_features:
+        parts.append('<div class="flex flex-wrap gap-8 mb-16 justify-center">')
+        parts.extend(
+            f'<div class="w-full md:w-80">{_feature_card_html(feature, is_featured=True)}</div>'
+            for feature in featured_features[:3]
         )
+        parts.append("</div>")
 
-    with ui.element("section").style(cta_bg_style).classes("section-padding"):
-        with ui.column().classes("max-w-4xl mx-auto text-center px-6 slide-up"):
-            # CTA headline
-            ui.label(cta.headline).classes("text-4xl md:text-5xl font-bold mb-6 text-gray-800")
+    # Additional features grid
+    if other_features:
+        parts.append('<div class="text-2xl font-bold text-center mb-8 text-gray-800">More Features</div>')
+        parts.append('<div class="grid grid-cols-3 gap-6 w-full">')
+        parts.extend(_feature_card_html(feature) for feature in other_features)
+        parts.append("</div>")
 
-            # CTA subheadline
-            if cta.subheadline:
-                ui.label(cta.subheadline).classes("text-xl font-medium mb-4 text-gray-700")
+    parts.append("</div></section>")
+    ui.html("".join(parts)).classes("w-full")
 
-            # CTA description
-            if cta.description:
-                ui.label(cta.description).classes("text-lg mb-12 max-w-2xl mx-auto text-gray-600 leading-relaxed")
 
-            # CTA buttons
-            with ui.row().classes("gap-6 justify-center flex-wrap"):
-                # Primary button
-                primary_url = cta.primary_button_url
+def _cta_html(cta: CallToActionSection) -> str:
+    """Render a call-to-action section as HTML."""
+    # CTA styling is built when the section is saved
+    cta_bg_style = cta.computed_style or build_cta_style(cta)
+    return _CTA_TPL.render(cta=cta, style=cta_bg_style)
 
-                def handle_cta_primary_click(url=primary_url):
-                    ui.navigate.to(url)
 
-                primary_btn = ui.button(cta.primary_button_text, on_click=handle_cta_primary_click)
+def _unique_markup(sections: Iterable[T], render: Callable[[T], str]) -> List[str]:
+    """Render sections in order, dropping any whose markup repeats an earlier one."""
+    return list(dict.fromkeys(render(section) for section in sections))
 
-                if cta.primary_button_style == "primary":
-                    primary_btn.classes("cta-button px-10 py-4 text-lg rounded-xl shadow-lg")
-                else:
-                    primary_btn.classes("px-10 py-4 text-lg rounded-xl").props("outline")
 
-                # Secondary button
-                if cta.secondary_button_text and cta.secondary_button_url:
-                    secondary_url = cta.secondary_button_url
+def _render_above_fold(hero_sections: List[HeroSection]):
+    """Render the sections visible on first paint."""
+    for markup in _unique_markup(hero_sections, _hero_html):
+        ui.html(markup).classes("w-full")
 
-                    def handle_cta_secondary_click(url=secondary_url):
-                        ui.navigate.to(url)
 
-                    secondary_btn = ui.button(cta.secondary_button_text, on_click=handle_cta_secondary_click)
+def _render_below_fold(
+    featured_features: List[Feature], other_features: List[Feature], cta_sections: List[CallToActionSection]
+):
+    """Render the features and CTA sections."""
+    create_features_section(featured_features, other_features)
 
-                    if cta.secondary_button_style == "primary":
-                        secondary_btn.classes("cta-button px-10 py-4 text-lg rounded-xl shadow-lg")
-                    else:
-                        secondary_btn.classes(
-                            "px-10 py-4 text-lg rounded-xl border-2 border-gray-300 bg-white hover:bg-gray-50 text-gray-700 transition-all"
-                        ).props("outline")
+    for markup in _unique_markup(cta_sections, _cta_html):
+        ui.html(markup).classes("w-full")
 
 
-def create_landing_page_ui(landing_page: LandingPage):
+def create_landing_page_ui(bundle: LandingPageBundle):
     """Create the complete landing page UI."""
-    if landing_page.id is None:
-        ui.label("Landing page not found").classes("text-center text-xl text-red-600")
-        return
-
-    # Get page components
-    hero_sections = LandingPageService.get_hero_sections(landing_page.id)
-    features = LandingPageService.get_features(landing_page.id)
-    cta_sections = LandingPageService.get_cta_sections(landing_page.id)
+    landing_page = bundle.page
 
     # Set page metadata
     ui.add_head_html(f'''
@@ -326,21 +330,23 @@ def create_landing_page_ui(landing_page: LandingPage):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
     ''')
 
-    # Hero sections
-    for hero in hero_sections:
-        create_hero_section(hero)
+    _render_above_fold(bundle.hero_sections)
+
+    # Everything below the hero is rendered once the page shell has been painted
+    below_fold = ui.element("div").classes("w-full")
 
-    # Features section
-    if features:
-        create_features_section(features)
+    def render_below_fold():
+        with below_fold:
+            _render_below_fold(bundle.featured_features, bundle.other_features, bundle.cta_sections)
 
-    # CTA sections
-    for cta in cta_sections:
-        create_cta_section(cta)
+    ui.timer(0.0, render_below_fold, once=True)
 
 
 def create():
     """Create the landing page module."""
+    app.add_static_files("/fonts", FONTS_DIR, max_cache_age=FONTS_MAX_CACHE_AGE)
+    app.add_api_route(STYLES_PATH, serve_styles, methods=["GET"], include_in_schema=False)
+
     # Apply theme and styles
     apply_modern_theme()
     add_custom_styles()
@@ -349,15 +355,20 @@ def create():
     def landing_page():
         """Main landing page."""
         # Try to get existing landing page, create sample data if none exists
-        page = LandingPageService.get_active_landing_page("home")
+        bundle = LandingPageService.get_page_bundle("home")
 
-        if page is None:
+        if bundle is None:
             try:
-                page = LandingPageService.create_sample_data()
+                LandingPageService.create_sample_data()
                 ui.notify("Sample landing page created!", type="info")
             except Exception as e:
                 logger.error(f"Error creating sample landing page data: {str(e)}", exc_info=True)
                 ui.label(f"Error creating landing page: {str(e)}").classes("text-center text-xl text-red-600 p-8")
                 return
+            bundle = LandingPageService.get_page_bundle("home")
+
+        if bundle is None:
+            ui.label("Landing page not found").classes("text-center text-xl text-red-600")
+            return
 
-        create_landing_page_ui(page)
+        create_landing_page_ui(bundle)
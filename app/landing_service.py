@@ -1,7 +1,18 @@
 """Service layer for landing page management."""
 
-from typing import List, Optional
-from sqlmodel import select, and_, asc
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, asc, desc
 from app.database import get_session
 from app.models import (
     LandingPage,
@@ -9,70 +20,355 @@ from app.models import (
     Feature,
     CallToActionSection,
     LandingPageTheme,
-    LandingPageCreate,
-    HeroSectionCreate,
-    FeatureCreate,
-    CallToActionSectionCreate,
+    LandingPageDocument,
+)
+
+# Write schemas only appear in annotations, the read path never needs them
+if TYPE_CHECKING:
+    from app.models import LandingPageCreate, HeroSectionCreate, FeatureCreate, CallToActionSectionCreate
+
+logger = logging.getLogger(__name__)
+
+# Rendered content changes rarely; cached pages and page bundles are reloaded at most this often
+BUNDLE_TTL_SECONDS = 30
+
+# Inline section styles; colors and URLs are validated by the Create schemas before they get here
+DEFAULT_HERO_BG = "linear-gradient(135deg, #1e293b 0%, #334155 100%)"
+DEFAULT_CTA_BG = "linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%)"
+_HERO_LAYOUT_STYLE = "min-height: 100vh; position: relative; overflow: hidden;"
+_BACKGROUND_IMAGE_STYLE = "background-size: cover; background-position: center;"
+
+
+def build_hero_style(hero: Union[HeroSection, HeroSectionCreate]) -> str:
+    """Build the inline style of a hero section."""
+    parts = [
+        f"background: {hero.background_color or DEFAULT_HERO_BG};",
+        f"color: {hero.text_color or '#ffffff'};",
+        _HERO_LAYOUT_STYLE,
+    ]
+    if hero.background_image_url:
+        parts.append(f"background-image: url('{hero.background_image_url}'); {_BACKGROUND_IMAGE_STYLE}")
+    return " ".join(parts)
+
+
+def build_cta_style(cta: Union[CallToActionSection, CallToActionSectionCreate]) -> str:
+    """Build the inline style of a CTA section."""
+    parts = [
+        f"background: {cta.background_color or DEFAULT_CTA_BG};",
+        f"color: {cta.text_color or '#1f2937'};",
+    ]
+    if cta.background_image_url:
+        parts.append(f"background-image: url('{cta.background_image_url}'); {_BACKGROUND_IMAGE_STYLE}")
+    return " ".join(parts)
+
+
+def split_featured(features: List[Feature]) -> Tuple[List[Feature], List[Feature]]:
+    """Split features ordered featured-first into (featured, other) where `is_featured` flips."""
+    for index, feature in enumerate(features):
+        if not feature.is_featured:
+            return features[:index], features[index:]
+    return features, []
+
+
+# Read queries are built once at import; values are bound per call, so each execution reuses the compiled SQL
+_ACTIVE_PAGE_STMT = select(LandingPage).where(LandingPage.slug == bindparam("slug"), LandingPage.is_active)
+# Only active sections are loaded into the page's collections
+_SECTION_LOADERS = (
+    selectinload(LandingPage.hero_sections.and_(HeroSection.is_active)),  # type: ignore[attr-defined]
+    selectinload(LandingPage.features.and_(Feature.is_active)),  # type: ignore[attr-defined]
+    selectinload(LandingPage.cta_sections.and_(CallToActionSection.is_active)),  # type: ignore[attr-defined]
+)
+_PAGE_WITH_SECTIONS_STMT = _ACTIVE_PAGE_STMT.options(*_SECTION_LOADERS)
+# Publishing locks the page row, so publishes of a page run one after another and each reads the previous commit.
+# FOR NO KEY UPDATE still lets sections be inserted under the page meanwhile; they are picked up by their own publish.
+_PAGE_BY_ID_WITH_SECTIONS_STMT = (
+    select(LandingPage)
+    .where(LandingPage.id == bindparam("landing_page_id"))
+    .options(*_SECTION_LOADERS)
+    .with_for_update(key_share=True)
+)
+_DOCUMENT_STMT = select(LandingPageDocument).where(LandingPageDocument.slug == bindparam("slug"))
+_ACTIVE_DOCUMENT_STMT = _DOCUMENT_STMT.where(LandingPageDocument.is_active)
+_HERO_SECTIONS_STMT = (
+    select(HeroSection)
+    .where(HeroSection.landing_page_id == bindparam("landing_page_id"), HeroSection.is_active)
+    .order_by(asc(HeroSection.display_order))
+)
+_FEATURES_STMT = (
+    select(Feature)
+    .where(Feature.landing_page_id == bindparam("landing_page_id"), Feature.is_active)
+    .order_by(asc(Feature.display_order), asc(Feature.title))
+)
+_FEATURES_PARTITIONED_STMT = (
+    select(Feature)
+    .where(Feature.landing_page_id == bindparam("landing_page_id"), Feature.is_active)
+    .order_by(desc(Feature.is_featured), asc(Feature.display_order), asc(Feature.title))
+)
+_CTA_SECTIONS_STMT = (
+    select(CallToActionSection)
+    .where(CallToActionSection.landing_page_id == bindparam("landing_page_id"), CallToActionSection.is_active)
+    .order_by(asc(CallToActionSection.display_order))
+)
+_THEME_STMT = select(LandingPageTheme).where(LandingPageTheme.name == bindparam("name"), LandingPageTheme.is_active)
+
+
+@dataclass(frozen=True, slots=True)
+class LandingPageSummary:
+    """Read-only copy of a landing page row, detached from any session so it can be shared between requests."""
+
+    id: int
+    title: str
+    slug: str
+    is_active: bool
+    meta_title: Optional[str]
+    meta_description: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+@dataclass(frozen=True, slots=True)
+class LandingPageBundle:
+    """A landing page together with all of its active sections, ready for rendering."""
+
+    page: LandingPage
+    hero_sections: List[HeroSection]
+    featured_features: List[Feature]
+    other_features: List[Feature]
+    cta_sections: List[CallToActionSection]
+    etag: str = ""
+
+
+def _content_etag(page: LandingPage, *sections: Union[HeroSection, Feature, CallToActionSection]) -> str:
+    """Fingerprint the rendered content from row identities and modification times."""
+    stamp = "|".join(f"{type(row).__name__}:{row.id}:{row.updated_at}" for row in (page, *sections))
+    return hashlib.blake2b(stamp.encode(), digest_size=8).hexdigest()
+
+
+def _cache_epoch() -> int:
+    """Current time bucket; cache entries keyed on an older bucket are never hit again."""
+    return int(time.monotonic() // BUNDLE_TTL_SECONDS)
+
+
+@lru_cache(maxsize=32)
+def _active_page(slug: str, epoch: int) -> Optional[LandingPageSummary]:
+    """Load an active landing page as a frozen summary, so the cached copy can be handed to every caller."""
+    with get_session() as session:
+        page = session.exec(_ACTIVE_PAGE_STMT, params={"slug": slug}).first()
+        return LandingPageSummary(**page.model_dump()) if page is not None else None
+
+
+@lru_cache(maxsize=32)
+def _bundle(slug: str, epoch: int) -> Optional[LandingPageBundle]:
+    """Load a page bundle. `epoch` is a time bucket so cached entries expire after BUNDLE_TTL_SECONDS."""
+    document = LandingPageService.get_page_document(slug)
+    if document is None:
+        return None
+
+    content = document.content
+    featured_features, other_features = split_featured([Feature.model_validate(row) for row in content["features"]])
+    return LandingPageBundle(
+        page=LandingPage.model_validate(content["page"]),
+        hero_sections=[HeroSection.model_validate(row) for row in content["hero"]],
+        featured_features=featured_features,
+        other_features=other_features,
+        cta_sections=[CallToActionSection.model_validate(row) for row in content["cta"]],
+        etag=document.etag,
+    )
+
+
+# Demonstration content, built once at import; rows are plain dicts ready for bulk inserts
+_SAMPLE_PAGE: Dict[str, Any] = {
+    "title": "Modern Landing Page",
+    "slug": "home",
+    "meta_title": "Modern Landing Page - Beautiful Design",
+    "meta_description": "A modern and elegant landing page with clean design and engaging features.",
+}
+_SAMPLE_HEROES: Tuple[Dict[str, Any], ...] = (
+    {
+        "headline": "Transform Your Business with Modern Solutions",
+        "subheadline": "Unlock your potential with our cutting-edge platform",
+        "description": "Experience the future of business automation with our intuitive, powerful, and beautifully designed platform that grows with your needs.",
+        "background_color": "#1e293b",
+        "text_color": "#ffffff",
+        "primary_button_text": "Get Started",
+        "primary_button_url": "/signup",
+        "alignment": "center",
+        "height": "full",
+    },
+)
+# All rows share the same keys so they go out as a single INSERT
+_SAMPLE_FEATURES: Tuple[Dict[str, Any], ...] = (
+    {
+        "title": "Lightning Fast Performance",
+        "description": "Built with modern technology stack for maximum speed and reliability. Experience blazing-fast load times and seamless user interactions.",
+        "icon": "speed",
+        "icon_color": "#10b981",
+        "display_order": 1,
+        "is_featured": True,
+    },
+    {
+        "title": "Intuitive Design",
+        "description": "User-centered design that makes complex tasks simple. Our interface adapts to your workflow, not the other way around.",
+        "icon": "design_services",
+        "icon_color": "#3b82f6",
+        "display_order": 2,
+        "is_featured": True,
+    },
+    {
+        "title": "Enterprise Security",
+        "description": "Bank-level security with end-to-end encryption, SSO integration, and compliance with industry standards.",
+        "icon": "security",
+        "icon_color": "#8b5cf6",
+        "display_order": 3,
+        "is_featured": True,
+    },
+    {
+        "title": "24/7 Support",
+        "description": "Our dedicated support team is available around the clock to help you succeed with personalized assistance.",
+        "icon": "support_agent",
+        "icon_color": "#f59e0b",
+        "display_order": 4,
+        "is_featured": False,
+    },
+    {
+        "title": "Scalable Infrastructure",
+        "description": "From startup to enterprise, our platform scales with your business without compromising performance.",
+        "icon": "trending_up",
+        "icon_color": "#ef4444",
+        "display_order": 5,
+        "is_featured": False,
+    },
+    {
+        "title": "Advanced Analytics",
+        "description": "Make data-driven decisions with comprehensive analytics and real-time insights into your business metrics.",
+        "icon": "analytics",
+        "icon_color": "#06b6d4",
+        "display_order": 6,
+        "is_featured": False,
+    },
 )
+_SAMPLE_CTAS: Tuple[Dict[str, Any], ...] = (
+    {
+        "headline": "Ready to Transform Your Business?",
+        "subheadline": "Join thousands of satisfied customers",
+        "description": "Start your journey today with our free trial. No credit card required, no hidden fees, just pure innovation at your fingertips.",
+        "primary_button_text": "Start Free Trial",
+        "primary_button_url": "/trial",
+        "secondary_button_text": "View Pricing",
+        "secondary_button_url": "/pricing",
+        "background_color": "#f8fafc",
+        "alignment": "center",
+        "size": "large",
+    },
+)
+# Section styles are derived from constant data, so they are computed here once as well
+_SAMPLE_HERO_ROWS = tuple({**hero, "computed_style": build_hero_style(HeroSection(**hero))} for hero in _SAMPLE_HEROES)
+_SAMPLE_CTA_ROWS = tuple({**cta, "computed_style": build_cta_style(CallToActionSection(**cta))} for cta in _SAMPLE_CTAS)
 
 
 class LandingPageService:
     """Service for managing landing pages and their components."""
 
     @staticmethod
-    def get_active_landing_page(slug: str = "home") -> Optional[LandingPage]:
-        """Get an active landing page by slug."""
+    def get_active_landing_page(slug: str = "home") -> Optional[LandingPageSummary]:
+        """Get an active landing page by slug, served from a short-lived cache."""
+        return _active_page(slug, _cache_epoch())
+
+    @staticmethod
+    def get_landing_page_with_sections(slug: str = "home") -> Optional[LandingPage]:
+        """Get an active landing page by slug with its active hero, feature and CTA sections eagerly loaded."""
         with get_session() as session:
-            statement = select(LandingPage).where(and_(LandingPage.slug == slug, LandingPage.is_active))
-            return session.exec(statement).first()
+            return session.exec(_PAGE_WITH_SECTIONS_STMT, params={"slug": slug}).first()
 
     @staticmethod
     def get_hero_sections(landing_page_id: int) -> List[HeroSection]:
         """Get active hero sections for a landing page, sorted by display order."""
         with get_session() as session:
-            statement = (
-                select(HeroSection)
-                .where(
-                    and_(
-                        HeroSection.landing_page_id == landing_page_id,
-                        HeroSection.is_active,
-                    )
-                )
-                .order_by(asc(HeroSection.display_order))
-            )
-            return list(session.exec(statement).all())
+            return list(session.exec(_HERO_SECTIONS_STMT, params={"landing_page_id": landing_page_id}).all())
 
     @staticmethod
     def get_features(landing_page_id: int) -> List[Feature]:
         """Get active features for a landing page, sorted by display order."""
         with get_session() as session:
-            statement = (
-                select(Feature)
-                .where(
-                    and_(
-                        Feature.landing_page_id == landing_page_id,
-                        Feature.is_active,
-                    )
-                )
-                .order_by(asc(Feature.display_order), asc(Feature.title))
+            return list(session.exec(_FEATURES_STMT, params={"landing_page_id": landing_page_id}).all())
+
+    @staticmethod
+    def get_features_partitioned(landing_page_id: int) -> Tuple[List[Feature], List[Feature]]:
+        """Get active features for a landing page split into (featured, other), each sorted by display order."""
+        with get_session() as session:
+            return split_featured(
+                list(session.exec(_FEATURES_PARTITIONED_STMT, params={"landing_page_id": landing_page_id}).all())
             )
-            return list(session.exec(statement).all())
 
     @staticmethod
     def get_cta_sections(landing_page_id: int) -> List[CallToActionSection]:
         """Get active CTA sections for a landing page, sorted by display order."""
         with get_session() as session:
-            statement = (
-                select(CallToActionSection)
-                .where(
-                    and_(
-                        CallToActionSection.landing_page_id == landing_page_id,
-                        CallToActionSection.is_active,
-                    )
-                )
-                .order_by(asc(CallToActionSection.display_order))
-            )
-            return list(session.exec(statement).all())
+            return list(session.exec(_CTA_SECTIONS_STMT, params={"landing_page_id": landing_page_id}).all())
+
+    @staticmethod
+    def get_page_bundle(slug: str = "home") -> Optional[LandingPageBundle]:
+        """Get an active landing page with its sections, served from a short-lived cache."""
+        return _bundle(slug, _cache_epoch())
+
+    @staticmethod
+    def get_page_document(slug: str = "home") -> Optional[LandingPageDocument]:
+        """Get the published document of an active landing page, publishing pages that never were."""
+        with get_session() as session:
+            document = session.exec(_ACTIVE_DOCUMENT_STMT, params={"slug": slug}).first()
+        if document is not None:
+            return document
+
+        page = LandingPageService.get_active_landing_page(slug)
+        if page is None or page.id is None:
+            return None
+        return LandingPageService.publish(page.id)
+
+    @staticmethod
+    def publish(landing_page_id: int) -> Optional[LandingPageDocument]:
+        """Rebuild the read document of a landing page from its normalized rows."""
+        with get_session() as session:
+            page = session.exec(_PAGE_BY_ID_WITH_SECTIONS_STMT, params={"landing_page_id": landing_page_id}).first()
+            if page is None:
+                return None
+
+            # Collections hold the active sections in display order, features featured-first
+            hero_sections, features, cta_sections = page.hero_sections, page.features, page.cta_sections
+
+            slug = page.slug
+            values = {
+                "is_active": page.is_active,
+                "content": {
+                    "page": page.model_dump(mode="json"),
+                    "hero": [hero.model_dump(mode="json") for hero in hero_sections],
+                    "features": [feature.model_dump(mode="json") for feature in features],
+                    "cta": [cta.model_dump(mode="json") for cta in cta_sections],
+                },
+                "etag": _content_etag(page, *hero_sections, *features, *cta_sections),
+            }
+
+            document = session.exec(_DOCUMENT_STMT, params={"slug": slug}).first() or LandingPageDocument(slug=slug)
+            document.sqlmodel_update(values)
+            session.add(document)
+            try:
+                session.commit()
+            except IntegrityError:
+                # The page lock orders publishes of this page, but anything else writing the slug's document can win
+                logger.warning(f"Landing page document {slug!r} was inserted concurrently, updating it instead")
+                session.rollback()
+                document = session.exec(_DOCUMENT_STMT, params={"slug": slug}).one()
+                document.sqlmodel_update(values)
+                session.commit()
+            session.refresh(document)
+
+        LandingPageService.clear_cache()
+        return document
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached pages and page bundles. Called whenever a page is published."""
+        _active_page.cache_clear()
+        _bundle.cache_clear()
 
     @staticmethod
     def create_landing_page(data: LandingPageCreate) -> LandingPage:
@@ -82,17 +378,22 @@ class LandingPageService:
             session.add(landing_page)
             session.commit()
             session.refresh(landing_page)
-            return landing_page
+
+        if landing_page.id is not None:
+            LandingPageService.publish(landing_page.id)
+        return landing_page
 
     @staticmethod
     def create_hero_section(data: HeroSectionCreate) -> HeroSection:
         """Create a new hero section."""
         with get_session() as session:
-            hero_section = HeroSection(**data.model_dump())
+            hero_section = HeroSection(**data.model_dump(), computed_style=build_hero_style(data))
             session.add(hero_section)
             session.commit()
             session.refresh(hero_section)
-            return hero_section
+
+        LandingPageService.publish(hero_section.landing_page_id)
+        return hero_section
 
     @staticmethod
     def create_feature(data: FeatureCreate) -> Feature:
@@ -102,132 +403,53 @@ class LandingPageService:
             session.add(feature)
             session.commit()
             session.refresh(feature)
-            return feature
+
+        LandingPageService.publish(feature.landing_page_id)
+        return feature
 
     @staticmethod
     def create_cta_section(data: CallToActionSectionCreate) -> CallToActionSection:
         """Create a new CTA section."""
         with get_session() as session:
-            cta_section = CallToActionSection(**data.model_dump())
+            cta_section = CallToActionSection(**data.model_dump(), computed_style=build_cta_style(data))
             session.add(cta_section)
             session.commit()
             session.refresh(cta_section)
-            return cta_section
+
+        LandingPageService.publish(cta_section.landing_page_id)
+        return cta_section
 
     @staticmethod
     def get_theme(name: str = "default") -> Optional[LandingPageTheme]:
         """Get a theme by name."""
         with get_session() as session:
-            statement = select(LandingPageTheme).where(
-                and_(
-                    LandingPageTheme.name == name,
-                    LandingPageTheme.is_active,
-                )
-            )
-            return session.exec(statement).first()
+            return session.exec(_THEME_STMT, params={"name": name}).first()
 
     @staticmethod
     def create_sample_data() -> LandingPage:
         """Create sample landing page data for demonstration."""
-        # Create landing page
-        landing_page_data = LandingPageCreate(
-            title="Modern Landing Page",
-            slug="home",
-            meta_title="Modern Landing Page - Beautiful Design",
-            meta_description="A modern and elegant landing page with clean design and engaging features.",
-        )
-        landing_page = LandingPageService.create_landing_page(landing_page_data)
-
-        if landing_page.id is None:
-            raise ValueError("Landing page creation failed")
-
-        # Create hero section
-        hero_data = HeroSectionCreate(
-            landing_page_id=landing_page.id,
-            headline="Transform Your Business with Modern Solutions",
-            subheadline="Unlock your potential with our cutting-edge platform",
-            description="Experience the future of business automation with our intuitive, powerful, and beautifully designed platform that grows with your needs.",
-            background_color="#1e293b",
-            text_color="#ffffff",
-            primary_button_text="Get Started",
-            primary_button_url="/signup",
-            alignment="center",
-            height="full",
-        )
-        LandingPageService.create_hero_section(hero_data)
-
-        # Create features
-        features_data = [
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="Lightning Fast Performance",
-                description="Built with modern technology stack for maximum speed and reliability. Experience blazing-fast load times and seamless user interactions.",
-                icon="speed",
-                icon_color="#10b981",
-                display_order=1,
-                is_featured=True,
-            ),
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="Intuitive Design",
-                description="User-centered design that makes complex tasks simple. Our interface adapts to your workflow, not the other way around.",
-                icon="design_services",
-                icon_color="#3b82f6",
-                display_order=2,
-                is_featured=True,
-            ),
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="Enterprise Security",
-                description="Bank-level security with end-to-end encryption, SSO integration, and compliance with industry standards.",
-                icon="security",
-                icon_color="#8b5cf6",
-                display_order=3,
-                is_featured=True,
-            ),
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="24/7 Support",
-                description="Our dedicated support team is available around the clock to help you succeed with personalized assistance.",
-                icon="support_agent",
-                icon_color="#f59e0b",
-                display_order=4,
-            ),
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="Scalable Infrastructure",
-                description="From startup to enterprise, our platform scales with your business without compromising performance.",
-                icon="trending_up",
-                icon_color="#ef4444",
-                display_order=5,
-            ),
-            FeatureCreate(
-                landing_page_id=landing_page.id,
-                title="Advanced Analytics",
-                description="Make data-driven decisions with comprehensive analytics and real-time insights into your business metrics.",
-                icon="analytics",
-                icon_color="#06b6d4",
-                display_order=6,
-            ),
-        ]
-
-        for feature_data in features_data:
-            LandingPageService.create_feature(feature_data)
-
-        # Create CTA section
-        cta_data = CallToActionSectionCreate(
-            landing_page_id=landing_page.id,
-            headline="Ready to Transform Your Business?",
-            subheadline="Join thousands of satisfied customers",
-            description="Start your journey today with our free trial. No credit card required, no hidden fees, just pure innovation at your fingertips.",
-            primary_button_text="Start Free Trial",
-            primary_button_url="/trial",
-            secondary_button_text="View Pricing",
-            secondary_button_url="/pricing",
-            background_color="#f8fafc",
-            alignment="center",
-            size="large",
-        )
-        LandingPageService.create_cta_section(cta_data)
+        with get_session() as session:
+            # Everything goes out in one transaction: the page, then one INSERT per section table
+            with session.begin():
+                # Create landing page first, its id is needed by the sections
+                landing_page = LandingPage(**_SAMPLE_PAGE)
+                session.add(landing_page)
+                session.flush()
+
+                if landing_page.id is None:
+                    raise ValueError("Landing page creation failed")
+
+                for model, rows in (
+                    (HeroSection, _SAMPLE_HERO_ROWS),
+                    (Feature, _SAMPLE_FEATURES),
+                    (CallToActionSection, _SAMPLE_CTA_ROWS),
+                ):
+                    session.bulk_insert_mappings(
+                        model,  # type: ignore[arg-type]
+                        [{**row, "landing_page_id": landing_page.id} for row in rows],
+                    )
+
+            session.refresh(landing_page)
 
+        LandingPageService.publish(landing_page.id)
         return landing_page
@@ -1,6 +1,53 @@
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+import re
+from sqlmodel import SQLModel, Field, Relationship, JSON, Column, Index, text, asc, desc
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any
+from urllib.parse import urlparse
+from pydantic import AfterValidator
+from sqlalchemy import DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Values that end up inside inline style attributes and links. Gradient arguments may not open any other function
+# (url(), image-set(), ...) except numeric rgb/hsl colors, so a gradient can never pull in an external resource.
+_CSS_COLOR_FUNCTION = r"(?:rgba?|hsla?)\([0-9.,%/\sdeg]*\)"
+CSS_COLOR_PATTERN = re.compile(
+    rf"^#[0-9a-fA-F]{{3,8}}$|^linear-gradient\((?:[^;{{}}<>\"'()\\]|{_CSS_COLOR_FUNCTION})+\)$"
+)
+URL_UNSAFE_CHARS = frozenset("'\"()<>\\ \t\r\n")
+
+# Binary JSONB on Postgres (parsed once on write, indexable), plain JSON elsewhere
+JSON_DOCUMENT = JSON().with_variant(JSONB(), "postgresql")
+
+
+def validate_css_color(value: str) -> str:
+    """Accept hex colors and linear gradients only."""
+    if not CSS_COLOR_PATTERN.match(value):
+        raise ValueError(f"Invalid CSS color: {value}")
+    return value
+
+
+def validate_url(value: str) -> str:
+    """Accept relative and http(s) URLs that are safe to embed in CSS and HTML attributes."""
+    if urlparse(value).scheme not in ("", "http", "https") or not URL_UNSAFE_CHARS.isdisjoint(value):
+        raise ValueError(f"Invalid URL: {value}")
+    return value
+
+
+# Field types for user input that is embedded in inline styles and links
+CssColor = Annotated[str, AfterValidator(validate_css_color)]
+SafeUrl = Annotated[str, AfterValidator(validate_url)]
+
+
+def server_timestamp(on_update: bool = False) -> Any:
+    """Timestamp column filled in by the database on insert, and on every update if `on_update` is set.
+
+    The Python value stays None until the row has been written and refreshed, so it is optional on construction.
+    """
+    column = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now() if on_update else None, nullable=False
+    )
+    return Field(default=None, sa_column=column)
+
 
 # Landing Page Models
 
@@ -16,19 +63,28 @@ class LandingPage(SQLModel, table=True):
     is_active: bool = Field(default=True)
     meta_title: Optional[str] = Field(default=None, max_length=200)
     meta_description: Optional[str] = Field(default=None, max_length=500)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    # Relationships
-    hero_sections: List["HeroSection"] = Relationship(back_populates="landing_page")
-    features: List["Feature"] = Relationship(back_populates="landing_page")
-    cta_sections: List["CallToActionSection"] = Relationship(back_populates="landing_page")
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(on_update=True)
+
+    # Relationships, loaded in display order; one-way, sections refer to their page by landing_page_id only
+    hero_sections: List["HeroSection"] = Relationship(
+        sa_relationship_kwargs={"order_by": lambda: [asc(HeroSection.display_order)]}
+    )
+    features: List["Feature"] = Relationship(
+        sa_relationship_kwargs={
+            "order_by": lambda: [desc(Feature.is_featured), asc(Feature.display_order), asc(Feature.title)]
+        }
+    )
+    cta_sections: List["CallToActionSection"] = Relationship(
+        sa_relationship_kwargs={"order_by": lambda: [asc(CallToActionSection.display_order)]}
+    )
 
 
 class HeroSection(SQLModel, table=True):
     """Hero section content for landing pages."""
 
     __tablename__ = "hero_sections"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_hero_sections_page_active_order", "landing_page_id", "is_active", "display_order"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     landing_page_id: int = Field(foreign_key="landing_pages.id")
@@ -52,22 +108,25 @@ class HeroSection(SQLModel, table=True):
     # Layout and styling
     alignment: str = Field(default="center", max_length=20, description="left, center, right")
     height: str = Field(default="full", max_length=20, description="full, medium, compact")
+    computed_style: str = Field(default="", max_length=1000, description="Inline CSS built when the row is written")
 
     # Ordering
     display_order: int = Field(default=0)
     is_active: bool = Field(default=True)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    # Relationships
-    landing_page: LandingPage = Relationship(back_populates="hero_sections")
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(on_update=True)
 
 
 class Feature(SQLModel, table=True):
     """Feature highlight for landing pages."""
 
     __tablename__ = "features"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_features_page_active_order", "landing_page_id", "is_active", "display_order", "title"),
+        # Serves the featured-first listing of a page's features, in the same order as the relationship
+        Index("ix_features_page_featured_order", "landing_page_id", text("is_featured DESC"), "display_order", "title"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     landing_page_id: int = Field(foreign_key="landing_pages.id")
@@ -94,17 +153,15 @@ class Feature(SQLModel, table=True):
     is_featured: bool = Field(default=False, description="Highlight this feature")
     is_active: bool = Field(default=True)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    # Relationships
-    landing_page: LandingPage = Relationship(back_populates="features")
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(on_update=True)
 
 
 class CallToActionSection(SQLModel, table=True):
     """Call-to-action section for landing pages."""
 
     __tablename__ = "cta_sections"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_cta_sections_page_active_order", "landing_page_id", "is_active", "display_order"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     landing_page_id: int = Field(foreign_key="landing_pages.id")
@@ -132,22 +189,29 @@ class CallToActionSection(SQLModel, table=True):
     # Layout
     alignment: str = Field(default="center", max_length=20, description="left, center, right")
     size: str = Field(default="medium", max_length=20, description="small, medium, large")
+    computed_style: str = Field(default="", max_length=1000, description="Inline CSS built when the row is written")
 
     # Ordering and display
     display_order: int = Field(default=0)
     is_active: bool = Field(default=True)
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    # Relationships
-    landing_page: LandingPage = Relationship(back_populates="cta_sections")
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(on_update=True)
 
 
 class LandingPageTheme(SQLModel, table=True):
     """Theme configuration for landing pages."""
 
     __tablename__ = "landing_page_themes"  # type: ignore[assignment]
+    __table_args__ = (
+        # Containment lookups on design tokens (design_tokens @> '{...}')
+        Index(
+            "ix_theme_tokens_gin",
+            "design_tokens",
+            postgresql_using="gin",
+            postgresql_ops={"design_tokens": "jsonb_path_ops"},
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100, unique=True)
@@ -170,11 +234,29 @@ class LandingPageTheme(SQLModel, table=True):
 
     # Additional styling options
     custom_css: Optional[str] = Field(default=None, description="Custom CSS overrides")
-    design_tokens: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="Additional design tokens")
+    design_tokens: Dict[str, Any] = Field(
+        default_factory=dict,
+        sa_column=Column(JSON_DOCUMENT, server_default="{}", nullable=False),
+        description="Additional design tokens",
+    )
+
+    is_active: bool = Field(default=True)
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(on_update=True)
+
 
+class LandingPageDocument(SQLModel, table=True):
+    """Render-ready snapshot of a landing page and its active sections, rebuilt whenever the page is published."""
+
+    __tablename__ = "landing_page_documents"  # type: ignore[assignment]
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    slug: str = Field(unique=True, max_length=100)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # {"page": {...}, "hero": [...], "features": [...], "cta": [...]}, sections in display order
+    content: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON_DOCUMENT, nullable=False))
+    etag: str = Field(default="", max_length=32)
+    published_at: Optional[datetime] = server_timestamp(on_update=True)
 
 
 # Non-persistent schemas for validation and API responses
@@ -206,13 +288,13 @@ class HeroSectionCreate(SQLModel, table=False):
     headline: str = Field(max_length=300)
     subheadline: Optional[str] = Field(default=None, max_length=500)
     description: Optional[str] = Field(default=None, max_length=1000)
-    background_image_url: Optional[str] = Field(default=None, max_length=500)
-    background_color: Optional[str] = Field(default=None, max_length=50)
-    text_color: Optional[str] = Field(default=None, max_length=50)
+    background_image_url: Optional[SafeUrl] = Field(default=None, max_length=500)
+    background_color: Optional[CssColor] = Field(default=None, max_length=50)
+    text_color: Optional[CssColor] = Field(default=None, max_length=50)
     primary_button_text: Optional[str] = Field(default=None, max_length=100)
-    primary_button_url: Optional[str] = Field(default=None, max_length=500)
+    primary_button_url: Optional[SafeUrl] = Field(default=None, max_length=500)
     secondary_button_text: Optional[str] = Field(default=None, max_length=100)
-    secondary_button_url: Optional[str] = Field(default=None, max_length=500)
+    secondary_button_url: Optional[SafeUrl] = Field(default=None, max_length=500)
     alignment: str = Field(default="center", max_length=20)
     height: str = Field(default="full", max_length=20)
     display_order: int = Field(default=0)
@@ -225,12 +307,12 @@ class FeatureCreate(SQLModel, table=False):
     title: str = Field(max_length=200)
     description: str = Field(max_length=1000)
     icon: Optional[str] = Field(default=None, max_length=100)
-    icon_color: Optional[str] = Field(default=None, max_length=50)
-    image_url: Optional[str] = Field(default=None, max_length=500)
+    icon_color: Optional[CssColor] = Field(default=None, max_length=50)
+    image_url: Optional[SafeUrl] = Field(default=None, max_length=500)
     link_text: Optional[str] = Field(default=None, max_length=100)
-    link_url: Optional[str] = Field(default=None, max_length=500)
-    background_color: Optional[str] = Field(default=None, max_length=50)
-    text_color: Optional[str] = Field(default=None, max_length=50)
+    link_url: Optional[SafeUrl] = Field(default=None, max_length=500)
+    background_color: Optional[CssColor] = Field(default=None, max_length=50)
+    text_color: Optional[CssColor] = Field(default=None, max_length=50)
     display_order: int = Field(default=0)
     is_featured: bool = Field(default=False)
 
@@ -243,14 +325,14 @@ class CallToActionSectionCreate(SQLModel, table=False):
     subheadline: Optional[str] = Field(default=None, max_length=500)
     description: Optional[str] = Field(default=None, max_length=1000)
     primary_button_text: str = Field(max_length=100)
-    primary_button_url: str = Field(max_length=500)
+    primary_button_url: SafeUrl = Field(max_length=500)
     primary_button_style: str = Field(default="primary", max_length=50)
     secondary_button_text: Optional[str] = Field(default=None, max_length=100)
-    secondary_button_url: Optional[str] = Field(default=None, max_length=500)
+    secondary_button_url: Optional[SafeUrl] = Field(default=None, max_length=500)
     secondary_button_style: str = Field(default="secondary", max_length=50)
-    background_color: Optional[str] = Field(default=None, max_length=50)
-    text_color: Optional[str] = Field(default=None, max_length=50)
-    background_image_url: Optional[str] = Field(default=None, max_length=500)
+    background_color: Optional[CssColor] = Field(default=None, max_length=50)
+    text_color: Optional[CssColor] = Field(default=None, max_length=50)
+    background_image_url: Optional[SafeUrl] = Field(default=None, max_length=500)
     alignment: str = Field(default="center", max_length=20)
     size: str = Field(default="medium", max_length=20)
     display_order: int = Field(default=0)
@@ -1,10 +1,11 @@
 from app.database import create_tables
-import app.landing_page
 
 
 def startup() -> None:
     # this function is called before the first request
     create_tables()
 
-    # Register landing page module
-    app.landing_page.create()
+    # Register landing page module; imported here so that importing startup does not pull in the UI stack
+    from app import landing_page
+
+    landing_page.create()
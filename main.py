@@ -1,5 +1,6 @@
 import logging
 import os
+from app.landing_etag import LandingPageETagMiddleware
 from app.startup import startup
 from nicegui import app, ui
 from fastapi import FastAPI
@@ -17,7 +18,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["X-XSS-Protection"] = "1; mode=block"
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = "default-src 'self' http: https: data: blob: 'unsafe-inline'; frame-ancestors https://app.build/ https://www.app.build/ https://staging.app.build/"
+        response.headers["Content-Security-Policy"] = (
+            "default-src 'self' http: https: data: blob: 'unsafe-inline'; frame-ancestors https://app.build/ https://www.app.build/ https://staging.app.build/"
+        )
         return response
 
 
@@ -31,7 +34,8 @@ logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 
 app.on_startup(startup)
 
-# Add security headers middleware
+# The last middleware added runs outermost, so security headers also cover the HEAD responses answered by the ETag one
+app.add_middleware(LandingPageETagMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 
 ui.run(
@@ -1,12 +1,65 @@
-from typing import Generator
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Generator, Optional
 import pytest
-from app.startup import startup
-from nicegui.testing import User
+
+# Every pytest-xdist worker gets its own SQLite file in a fresh directory, so neither workers nor concurrent runs on
+# the same host share tables. Set APP_TEST_DATABASE_URL to run the suite against a server database instead (with
+# -n 0, as workers would then share it). This has to happen before app.database is imported, as it creates the
+# engine at import time.
+_WORKER_DB_DIR: Optional[Path] = None
+if os.environ.get("APP_TEST_DATABASE_URL"):
+    os.environ["APP_DATABASE_URL"] = os.environ["APP_TEST_DATABASE_URL"]
+else:
+    _WORKER_DB_DIR = Path(tempfile.mkdtemp(prefix=f"landing_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}_"))
+    os.environ["APP_DATABASE_URL"] = f"sqlite:///{_WORKER_DB_DIR / 'landing.db'}"
+# Test databases are thrown away, so commits need not wait for the disk
+os.environ.setdefault("APP_SQLITE_SYNCHRONOUS", "OFF")
+# Any relationship read that was not eager loaded fails the test rather than quietly adding a query per row
+os.environ.setdefault("APP_RAISE_ON_LAZY_LOAD", "1")
+
+from app.database import ENGINE, SessionLocal, reset_db  # noqa: E402
+from app.landing_service import LandingPageService  # noqa: E402
+from app.startup import startup  # noqa: E402
+from nicegui.testing import User  # noqa: E402
 
 pytest_plugins = ["nicegui.testing.plugin"]
 
 
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Delete this process's SQLite database, with its WAL and shared-memory files."""
+    if _WORKER_DB_DIR is not None:
+        ENGINE.dispose()
+        shutil.rmtree(_WORKER_DB_DIR, ignore_errors=True)
+
+
 @pytest.fixture
 def user(user: User) -> Generator[User, None, None]:
     startup()
     yield user
+
+
+@pytest.fixture(scope="session")
+def db_schema() -> Generator[None, None, None]:
+    """Create the schema once per test session."""
+    reset_db()
+    yield
+
+
+@pytest.fixture()
+def new_db(db_schema) -> Generator[None, None, None]:
+    """Run each test inside a transaction that is rolled back afterwards, with no cached pages."""
+    connection = ENGINE.connect()
+    transaction = connection.begin()
+    # Every session the app opens joins this transaction; its commits only release a SAVEPOINT
+    SessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+    LandingPageService.clear_cache()
+    try:
+        yield
+    finally:
+        SessionLocal.configure(bind=ENGINE)
+        transaction.rollback()
+        connection.close()
+        LandingPageService.clear_cache()
@@ -0,0 +1,86 @@
+"""Tests for landing page conditional requests."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.landing_etag import LandingPageETagMiddleware, etag_matches, landing_page_etag
+from app.landing_service import LandingPageService
+from app.models import FeatureCreate
+
+
+@pytest.fixture
+def client(new_db) -> TestClient:
+    """A stand-in landing page behind the ETag middleware."""
+    app = Starlette(
+        routes=[Route("/", lambda request: PlainTextResponse("landing page"), methods=["GET", "HEAD"])],
+        middleware=[Middleware(LandingPageETagMiddleware)],
+    )
+    return TestClient(app)
+
+
+def _current_etag() -> str:
+    bundle = LandingPageService.get_page_bundle("home")
+    assert bundle is not None
+    return landing_page_etag(bundle.etag)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        ('W/"abc-1"', True),
+        ('"abc-1"', True),
+        ('W/"old-1", W/"abc-1"', True),
+        ("*", True),
+        ('W/"abc-2"', False),
+        ("", False),
+    ],
+)
+def test_etag_matches(if_none_match, matches):
+    """Test that If-None-Match lists, wildcards and weak tags are compared per RFC 9110."""
+    assert etag_matches(if_none_match, 'W/"abc-1"') is matches
+
+
+def test_get_sets_validators(client):
+    """Test that GET renders the page and carries its ETag."""
+    LandingPageService.create_sample_data()
+
+    response = client.get("/", headers={"If-None-Match": _current_etag()})
+
+    # GET always renders, each page is bound to a fresh client
+    assert response.status_code == 200
+    assert response.text == "landing page"
+    assert response.headers["etag"] == _current_etag()
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_head_revalidation(client):
+    """Test that HEAD answers 304 only while the tag still matches the content and render version."""
+    LandingPageService.create_sample_data()
+    etag = _current_etag()
+
+    assert client.head("/").status_code == 200
+    assert client.head("/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.head("/", headers={"If-None-Match": f'W/"stale", {etag}'}).status_code == 304
+    assert client.head("/", headers={"If-None-Match": "*"}).status_code == 304
+
+    # A tag issued for the same content by a different release of the templates and code
+    bundle = LandingPageService.get_page_bundle("home")
+    assert bundle is not None
+    assert client.head("/", headers={"If-None-Match": f'W/"{bundle.etag}"'}).status_code == 200
+
+    # New content makes the old tag stale
+    page = LandingPageService.get_active_landing_page("home")
+    assert page is not None and page.id is not None
+    LandingPageService.create_feature(FeatureCreate(landing_page_id=page.id, title="New", description="New feature"))
+    assert client.head("/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_missing_page_is_not_tagged(client):
+    """Test that requests pass through untagged while there is no landing page."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
@@ -1,19 +1,9 @@
 """Tests for landing page module functionality."""
 
-import pytest
-from app.database import reset_db
 from app.landing_service import LandingPageService
 from app.landing_page import apply_modern_theme
 
 
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
-
-
 def test_apply_modern_theme():
     """Test that modern theme application doesn't raise errors."""
     # This should not raise any exceptions
@@ -116,7 +106,7 @@ def test_landing_page_ordering(new_db):
         assert features[i].display_order <= features[i + 1].display_order
 
 
-def test_landing_page_missing_data_handling():
+def test_landing_page_missing_data_handling(new_db):
     """Test handling of missing landing page data."""
     # Test with non-existent page
     page = LandingPageService.get_active_landing_page("nonexistent")
@@ -138,3 +128,70 @@ def test_landing_page_missing_data_handling():
     assert heroes == []
     assert features == []
     assert ctas == []
+
+
+def test_feature_card_html_escapes_content():
+    """Test that feature card markup escapes user-provided text."""
+    from app.landing_page import _feature_card_html
+    from app.models import Feature
+
+    feature = Feature(
+        landing_page_id=1,
+        title="<script>alert(1)</script>",
+        description="Fast & reliable",
+        icon="bolt",
+        link_text="Docs",
+        link_url="/docs?a=1&b=2",
+    )
+
+    featured_html = _feature_card_html(feature, is_featured=True)
+    assert "<script>" not in featured_html
+    assert "&lt;script&gt;" in featured_html
+    assert "Fast &amp; reliable" in featured_html
+    assert 'href="/docs?a=1&amp;b=2"' in featured_html
+    assert "Featured" in featured_html
+    assert "lazy-render" not in featured_html
+
+    assert "lazy-render" in _feature_card_html(feature)
+
+
+def test_serve_styles_precompressed():
+    """Test that the stylesheet is served gzipped to clients that accept it."""
+    import gzip
+    from app.landing_page import IMMUTABLE_CACHE_CONTROL, serve_styles
+
+    compressed = serve_styles(accept_encoding="gzip, deflate, br")
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    plain = serve_styles(accept_encoding="")
+    assert "content-encoding" not in plain.headers
+    assert gzip.decompress(compressed.body) == plain.body
+    assert b"font-face" in plain.body
+
+
+def test_declared_fonts_are_bundled():
+    """Test that every font the stylesheet declares or preloads ships with the app."""
+    import re
+    from app.landing_page import FONTS_DIR, _CUSTOM_STYLES_HTML, serve_styles
+
+    declared = re.findall(
+        r"/fonts/([\w.-]+)", bytes(serve_styles(accept_encoding="").body).decode() + _CUSTOM_STYLES_HTML
+    )
+    assert declared
+    for name in declared:
+        assert (FONTS_DIR / name).is_file(), name
+
+
+def test_identical_sections_rendered_once():
+    """Test that sections with identical markup are only emitted once."""
+    from app.landing_page import _hero_html, _unique_markup
+    from app.models import HeroSection
+
+    hero = HeroSection(id=1, landing_page_id=1, headline="Welcome", primary_button_text="Go")
+    duplicate = HeroSection(id=2, landing_page_id=1, headline="Welcome", primary_button_text="Go")
+    other = HeroSection(id=3, landing_page_id=1, headline="Welcome back", primary_button_text="Go")
+
+    markup = _unique_markup([hero, duplicate, other], _hero_html)
+    assert len(markup) == 2
+    assert "Welcome back" in markup[1]
@@ -1,18 +1,8 @@
 """UI smoke tests for landing page."""
 
-import pytest
-from app.database import reset_db
 from app.landing_service import LandingPageService
 
 
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
-
-
 def test_landing_page_service_integration(new_db):
     """Test that landing page service works correctly for UI integration."""
     # Test that sample data creation works
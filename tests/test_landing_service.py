@@ -1,9 +1,21 @@
 """Tests for landing page service."""
 
+import time
 import pytest
-from app.database import reset_db
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+from pydantic import ValidationError
+from sqlalchemy import delete, event, insert, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import col, select
+from app.database import ENGINE, SessionLocal, get_session
 from app.landing_service import LandingPageService
 from app.models import (
+    Feature,
+    HeroSection,
+    LandingPage,
+    LandingPageDocument,
+    LandingPageTheme,
     LandingPageCreate,
     HeroSectionCreate,
     FeatureCreate,
@@ -11,14 +23,6 @@ from app.models import (
 )
 
 
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
-
-
 def test_create_landing_page(new_db):
     """Test creating a new landing page."""
     data = LandingPageCreate(
@@ -91,6 +95,55 @@ def test_create_hero_section(new_db):
     assert hero.is_active is True
 
 
+def test_hero_section_computed_style(new_db):
+    """Test that the hero style is built when the section is saved."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+
+    hero = LandingPageService.create_hero_section(
+        HeroSectionCreate(
+            landing_page_id=page.id,
+            headline="Styled Hero",
+            background_color="#123456",
+            background_image_url="https://example.com/hero.jpg",
+        )
+    )
+
+    assert "background: #123456;" in hero.computed_style
+    assert "url('https://example.com/hero.jpg')" in hero.computed_style
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("background_color", "red; position: fixed"),
+        ("background_color", "linear-gradient(red,red),url(//t.co/p)"),
+        ("background_color", "linear-gradient(red, url(//t.co/p))"),
+        ("text_color", "#12345g"),
+        ("background_image_url", "https://example.com/a.jpg'); color: red"),
+        ("primary_button_url", "javascript:alert(1)"),
+    ],
+)
+def test_hero_section_rejects_unsafe_values(field, value):
+    """Test that values embedded in styles and links are validated."""
+    with pytest.raises(ValidationError):
+        HeroSectionCreate.model_validate({"landing_page_id": 1, "headline": "Hero", field: value})
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "#1e293b",
+        "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+        "linear-gradient(rgba(0,0,0,.5), hsl(220 40% 20%))",
+    ],
+)
+def test_hero_section_accepts_css_colors(value):
+    """Test that hex colors and gradients of plain colors are accepted."""
+    hero = HeroSectionCreate.model_validate({"landing_page_id": 1, "headline": "Hero", "background_color": value})
+    assert hero.background_color == value
+
+
 def test_get_hero_sections(new_db):
     """Test retrieving hero sections for a landing page."""
     # Create landing page
@@ -184,6 +237,28 @@ def test_get_features(new_db):
     assert features[1].title == "Feature B"
 
 
+def test_get_features_partitioned(new_db):
+    """Test retrieving features split into featured and regular ones."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+
+    for title, display_order, is_featured in [("C", 3, False), ("B", 2, True), ("A", 1, False), ("D", 4, True)]:
+        LandingPageService.create_feature(
+            FeatureCreate(
+                landing_page_id=page.id,
+                title=title,
+                description=f"Description {title}",
+                display_order=display_order,
+                is_featured=is_featured,
+            )
+        )
+
+    featured, other = LandingPageService.get_features_partitioned(page.id)
+
+    assert [f.title for f in featured] == ["B", "D"]
+    assert [f.title for f in other] == ["A", "C"]
+
+
 def test_create_cta_section(new_db):
     """Test creating a CTA section."""
     # Create landing page first
@@ -301,3 +376,300 @@ def test_get_components_for_nonexistent_page(new_db):
     assert heroes == []
     assert features == []
     assert ctas == []
+
+
+def test_get_page_bundle(new_db):
+    """Test retrieving a landing page together with its sections."""
+    landing_page = LandingPageService.create_sample_data()
+
+    bundle = LandingPageService.get_page_bundle("home")
+
+    assert bundle is not None
+    assert bundle.page.id == landing_page.id
+    assert len(bundle.hero_sections) == 1
+    assert [f.display_order for f in bundle.featured_features] == [1, 2, 3]
+    assert [f.display_order for f in bundle.other_features] == [4, 5, 6]
+    assert len(bundle.cta_sections) == 1
+
+
+def test_get_landing_page_with_sections(new_db):
+    """Test that active sections are loaded together with the landing page, in display order."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+    for order, featured in [(3, False), (2, True), (1, False)]:
+        LandingPageService.create_feature(
+            FeatureCreate(
+                landing_page_id=page.id,
+                title=f"Feature {order}",
+                description="Test",
+                display_order=order,
+                is_featured=featured,
+            )
+        )
+    # Deactivated sections stay in the database but not in the page
+    with get_session() as session:
+        session.add(Feature(landing_page_id=page.id, title="Hidden", description="Test", is_active=False))
+        session.add(HeroSection(landing_page_id=page.id, headline="Hidden", is_active=False))
+        session.commit()
+    LandingPageService.create_sample_data()
+
+    page = LandingPageService.get_landing_page_with_sections("test")
+    home = LandingPageService.get_landing_page_with_sections("home")
+
+    # Collections must be usable after the session has been closed
+    assert page is not None and home is not None
+    assert [f.display_order for f in page.features] == [2, 1, 3]
+    assert page.hero_sections == []
+    assert len(home.hero_sections) == 1
+    assert len(home.features) == 6
+    assert len(home.cta_sections) == 1
+
+
+def test_lazy_relationship_load_raises(new_db):
+    """Test that reading a relationship that was not eager loaded fails instead of issuing a query."""
+    sample = LandingPageService.create_sample_data()
+
+    with get_session() as session:
+        page = session.get(LandingPage, sample.id)
+        assert page is not None
+        with pytest.raises(InvalidRequestError, match="LandingPage.features"):
+            page.features
+
+
+def test_get_page_bundle_nonexistent(new_db):
+    """Test retrieving a bundle for a non-existent landing page."""
+    assert LandingPageService.get_page_bundle("nonexistent") is None
+
+
+def test_page_bundle_invalidated_on_write(new_db):
+    """Test that creating content is reflected in the cached bundle."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+
+    bundle = LandingPageService.get_page_bundle("test")
+    assert bundle is not None
+    assert bundle.hero_sections == []
+
+    LandingPageService.create_hero_section(HeroSectionCreate(landing_page_id=page.id, headline="New Hero"))
+
+    bundle = LandingPageService.get_page_bundle("test")
+    assert bundle is not None
+    assert [hero.headline for hero in bundle.hero_sections] == ["New Hero"]
+
+
+def test_page_bundle_etag_changes_on_write(new_db):
+    """Test that the bundle ETag follows content changes."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+
+    first = LandingPageService.get_page_bundle("test")
+    assert first is not None
+    assert first.etag
+
+    LandingPageService.clear_cache()
+    unchanged = LandingPageService.get_page_bundle("test")
+    assert unchanged is not None
+    assert unchanged.etag == first.etag
+
+    LandingPageService.create_feature(FeatureCreate(landing_page_id=page.id, title="New", description="New feature"))
+
+    changed = LandingPageService.get_page_bundle("test")
+    assert changed is not None
+    assert changed.etag != first.etag
+
+
+def test_publish_page_document(new_db):
+    """Test that publishing snapshots the page with its sections in display order."""
+    LandingPageService.create_sample_data()
+
+    document = LandingPageService.get_page_document("home")
+
+    assert document is not None
+    assert document.content["page"]["slug"] == "home"
+    assert len(document.content["hero"]) == 1
+    assert [f["display_order"] for f in document.content["features"]] == [1, 2, 3, 4, 5, 6]
+    assert len(document.content["cta"]) == 1
+
+    bundle = LandingPageService.get_page_bundle("home")
+    assert bundle is not None
+    assert bundle.etag == document.etag
+
+
+def test_unpublished_page_is_published_on_read(new_db):
+    """Test that pages written without the service still get a document."""
+    with get_session() as session:
+        session.add(LandingPage(title="Legacy Page", slug="legacy"))
+        session.commit()
+
+    bundle = LandingPageService.get_page_bundle("legacy")
+
+    assert bundle is not None
+    assert bundle.page.title == "Legacy Page"
+    assert LandingPageService.get_page_document("legacy") is not None
+
+
+@pytest.mark.skipif(ENGINE.dialect.name == "sqlite", reason="SQLite serializes writers, no duplicate insert")
+def test_publish_overwrites_concurrently_inserted_document(db_schema):
+    """Test that publishing wins over a document another request committed after it looked for one."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Raced Page", slug="raced"))
+    assert page.id is not None
+    # Back to a page that was never published
+    with ENGINE.begin() as connection:
+        connection.execute(delete(LandingPageDocument).where(col(LandingPageDocument.slug) == "raced"))
+
+    raced = []
+
+    def insert_competing_document(session, flush_context, instances):
+        # Another worker commits the document between this publish's lookup and its insert
+        if not raced and any(isinstance(obj, LandingPageDocument) for obj in session.new):
+            raced.append(True)
+            with ENGINE.begin() as connection:
+                connection.execute(insert(LandingPageDocument).values(slug="raced", content={}, etag="stale"))
+
+    event.listen(SessionLocal, "before_flush", insert_competing_document)
+    try:
+        document = LandingPageService.publish(page.id)
+
+        assert raced
+        assert document is not None
+        assert document.etag != "stale"
+        assert document.content["page"]["slug"] == "raced"
+        with get_session() as session:
+            documents = session.exec(select(LandingPageDocument).where(col(LandingPageDocument.slug) == "raced")).all()
+            assert [doc.etag for doc in documents] == [document.etag]
+    finally:
+        event.remove(SessionLocal, "before_flush", insert_competing_document)
+        with ENGINE.begin() as connection:
+            connection.execute(delete(LandingPageDocument).where(col(LandingPageDocument.slug) == "raced"))
+            connection.execute(delete(LandingPage).where(col(LandingPage.slug) == "raced"))
+        LandingPageService.clear_cache()
+
+
+@pytest.mark.skipif(ENGINE.dialect.name == "sqlite", reason="SQLite serializes writers, publishes cannot interleave")
+def test_concurrent_publishes_keep_newest_content(db_schema):
+    """Test that a publish started before a section was added cannot overwrite the document that includes it."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Busy Page", slug="busy"))
+    assert page.id is not None
+    page_id = page.id
+    with get_session() as session:
+        session.add(Feature(landing_page_id=page_id, title="F1", description="First feature"))
+        session.commit()
+
+    other_request = ThreadPoolExecutor(max_workers=1)
+    started: list[Future] = []
+
+    def add_feature_before_document_write(session, flush_context, instances):
+        # Another request adds and publishes a feature after this publish read the sections
+        documents = [obj for obj in (*session.new, *session.dirty) if isinstance(obj, LandingPageDocument)]
+        if started or not documents:
+            return
+        feature = FeatureCreate(landing_page_id=page_id, title="F2", description="Second feature")
+        started.append(other_request.submit(LandingPageService.create_feature, feature))
+        # Let it run until it finishes or waits on this publish's lock
+        with ENGINE.connect() as connection:
+            waiting = text("SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'")
+            deadline = time.monotonic() + 0.5
+            while not started[0].done() and not connection.execute(waiting).scalar() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+    event.listen(SessionLocal, "before_flush", add_feature_before_document_write)
+    try:
+        LandingPageService.publish(page_id)
+        assert started
+        started[0].result(timeout=5)
+
+        document = LandingPageService.get_page_document("busy")
+        assert document is not None
+        assert [feature["title"] for feature in document.content["features"]] == ["F1", "F2"]
+    finally:
+        event.remove(SessionLocal, "before_flush", add_feature_before_document_write)
+        other_request.shutdown()
+        with ENGINE.begin() as connection:
+            connection.execute(delete(Feature).where(col(Feature.landing_page_id) == page_id))
+            connection.execute(delete(LandingPageDocument).where(col(LandingPageDocument.slug) == "busy"))
+            connection.execute(delete(LandingPage).where(col(LandingPage.slug) == "busy"))
+        LandingPageService.clear_cache()
+
+
+def test_timestamps_set_by_database(new_db):
+    """Test that creation and update timestamps are filled in on insert."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+
+    assert page.created_at is not None
+    assert page.updated_at is not None
+
+
+def test_timestamps_optional_before_insert():
+    """Test that rows can be built without timestamps, which the database fills in."""
+    hero = HeroSection.model_validate({"landing_page_id": 1, "headline": "Hero"})
+
+    assert hero.created_at is None
+    assert hero.updated_at is None
+
+
+def test_slug_lookup_reuses_compiled_statement(new_db):
+    """Test that repeated page lookups are served from the compiled statement cache."""
+    LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    compiled = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # Sessions also emit SAVEPOINT statements inside the test transaction; only the page queries count
+        if statement.startswith("SELECT"):
+            compiled.append(context.compiled)
+
+    event.listen(ENGINE, "after_cursor_execute", record)
+    try:
+        assert LandingPageService.get_active_landing_page("test") is not None
+        assert LandingPageService.get_active_landing_page("missing") is None
+    finally:
+        event.remove(ENGINE, "after_cursor_execute", record)
+
+    assert len(compiled) == 2
+    assert compiled[0] is compiled[1]
+
+
+def test_active_landing_page_cached_until_write(new_db):
+    """Test that page lookups are cached and refreshed after a write."""
+    page = LandingPageService.create_landing_page(LandingPageCreate(title="Test Page", slug="test"))
+    assert page.id is not None
+
+    first = LandingPageService.get_active_landing_page("test")
+    assert first is not None
+    assert LandingPageService.get_active_landing_page("test") is first
+
+    # The cached page is shared, so it cannot be changed in place
+    with pytest.raises(FrozenInstanceError):
+        first.title = "Changed"  # type: ignore[misc]
+
+    LandingPageService.create_hero_section(HeroSectionCreate(landing_page_id=page.id, headline="New Hero"))
+
+    refreshed = LandingPageService.get_active_landing_page("test")
+    assert refreshed is not None
+    assert refreshed is not first
+    assert refreshed.id == page.id
+
+
+def test_theme_design_tokens(new_db):
+    """Test that design tokens round-trip and default to a fresh empty dict."""
+    with get_session() as session:
+        session.add(
+            LandingPageTheme(
+                name="default",
+                primary_color="#2563eb",
+                secondary_color="#64748b",
+                accent_color="#10b981",
+                design_tokens={"radius": {"card": "16px"}},
+            )
+        )
+        session.commit()
+
+    theme = LandingPageService.get_theme("default")
+    assert theme is not None
+    assert theme.design_tokens == {"radius": {"card": "16px"}}
+
+    plain = LandingPageTheme(name="plain", primary_color="#000", secondary_color="#111", accent_color="#222")
+    plain.design_tokens["spacing"] = "1rem"
+    assert (
+        LandingPageTheme(name="other", primary_color="#000", secondary_color="#111", accent_color="#222").design_tokens
+        == {}
+    )
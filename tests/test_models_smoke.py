@@ -1,10 +1,12 @@
 """Smoke test for SQLModel database setup."""
 
 import pytest
+from datetime import datetime, timezone
+from sqlalchemy import event, inspect
 from sqlmodel import SQLModel, text
 import os
 
-from app.database import create_tables, ENGINE
+from app.database import create_tables, upgrade_schema, ENGINE
 from app import models
 
 
@@ -28,6 +30,66 @@ def test_sqlmodel_smoke():
         assert table_name in db_tables, f"Table '{table_name}' not found in database"
 
 
+# The parts of the schema that changed since the first release, rolled back to how that release created them
+_FIRST_RELEASE_SCHEMA = [
+    "DROP INDEX ix_hero_sections_page_active_order, ix_features_page_active_order, "
+    "ix_features_page_featured_order, ix_cta_sections_page_active_order, ix_theme_tokens_gin",
+    "ALTER TABLE hero_sections DROP COLUMN computed_style",
+    "ALTER TABLE cta_sections DROP COLUMN computed_style",
+    "ALTER TABLE landing_page_themes ALTER COLUMN design_tokens DROP NOT NULL, "
+    "ALTER COLUMN design_tokens DROP DEFAULT, ALTER COLUMN design_tokens TYPE JSON",
+    *(
+        f"ALTER TABLE {table} ALTER COLUMN created_at DROP DEFAULT, ALTER COLUMN updated_at DROP DEFAULT, "
+        "ALTER COLUMN created_at TYPE TIMESTAMP, ALTER COLUMN updated_at TYPE TIMESTAMP"
+        for table in ("landing_pages", "hero_sections", "features", "cta_sections", "landing_page_themes")
+    ),
+]
+
+
+@pytest.mark.sqlmodel
+def test_upgrade_schema_from_first_release():
+    """Test that tables created by the first release are upgraded in place, and only once."""
+    create_tables()
+
+    with ENGINE.connect() as conn:
+        transaction = conn.begin()
+        try:
+            for statement in _FIRST_RELEASE_SCHEMA:
+                conn.execute(text(statement))
+            conn.execute(
+                text(
+                    "INSERT INTO landing_pages (title, slug, is_active, created_at, updated_at) "
+                    "VALUES ('Old', 'old', true, '2025-01-01 12:00', '2025-01-01 12:00')"
+                )
+            )
+
+            upgrade_schema(conn)
+
+            # Rows written without the new columns and timestamps are accepted again
+            conn.execute(
+                text(
+                    "INSERT INTO hero_sections (landing_page_id, headline, alignment, height, display_order, is_active) "
+                    "SELECT id, 'Hero', 'center', 'full', 0, true FROM landing_pages WHERE slug = 'old'"
+                )
+            )
+            # Naive timestamps were written in UTC and keep their instant
+            created_at = conn.execute(text("SELECT created_at FROM landing_pages WHERE slug = 'old'")).scalar_one()
+            assert created_at == datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+            inspector = inspect(conn)
+            for table in SQLModel.metadata.sorted_tables:
+                assert {index.name for index in table.indexes} <= {i["name"] for i in inspector.get_indexes(table.name)}
+            tokens = next(c for c in inspector.get_columns("landing_page_themes") if c["name"] == "design_tokens")
+            assert str(tokens["type"]) == "JSONB" and not tokens["nullable"]
+
+            statements = []
+            event.listen(conn, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            upgrade_schema(conn)
+            assert not [statement for statement in statements if statement.startswith(("ALTER", "CREATE", "UPDATE"))]
+        finally:
+            transaction.rollback()
+
+
 DATABRICKS_HOST = os.environ.get("DATABRICKS_HOST")
 DATABRICKS_TOKEN = os.environ.get("DATABRICKS_TOKEN")
 
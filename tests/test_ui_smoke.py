@@ -1,16 +1,5 @@
 """Simplified UI smoke test that avoids slot stack issues."""
 
-import pytest
-from app.database import reset_db
-
-
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
-
 
 def test_landing_page_module_imports():
     """Test that landing page module imports without errors."""